@@ -1,14 +1,15 @@
 #!/usr/bin/env python3
 """Utilities for managing the ELK server distribution."""
 
+import functools
 import os
 import platform
+import re
 import shutil
 import subprocess
 import zipfile
 from pathlib import Path
-
-import pooch
+from typing import Optional
 
 # Constants
 JAVA_MIN_VERSION = 17
@@ -20,12 +21,77 @@ ZIP_FILENAME = f"elk-server-{ELK_SERVER_VERSION}.zip"
 ZIP_URL = f"https://github.com/TypeFox/elk-server/releases/download/v{ELK_SERVER_VERSION}/{ZIP_FILENAME}"
 
 
-def get_java_version(java_path: str) -> int:
+def _parse_java_version(version: str) -> int:
     """
-    Get the major version of Java from the given path.
+    Parse the major version from a Java version string such as "17.0.2" or "1.8.0".
 
     Args:
-        java_path: Path to the Java executable
+        version: The Java version string
+
+    Returns:
+        int: The major version number
+    """
+    parts = version.split(".")
+    if parts[0] == "1":  # Old style version (1.8)
+        return int(parts[1])
+    return int(parts[0])
+
+
+def _read_release_version(java_path: Path) -> Optional[int]:
+    """
+    Read the Java version from the `release` file of the installation.
+
+    Args:
+        java_path: Resolved path to the Java executable
+
+    Returns:
+        Optional[int]: The major version number, or None if unavailable
+    """
+    release_path = java_path.parent.parent / "release"
+    try:
+        with open(release_path, encoding="utf-8") as f:
+            for line in f:
+                key, _, value = line.partition("=")
+                if key.strip() == "JAVA_VERSION":
+                    return _parse_java_version(value.strip().strip('"'))
+    except (OSError, IndexError, ValueError):
+        pass
+    return None
+
+
+def _parse_internal_version(output: str) -> Optional[int]:
+    """
+    Parse the major version from `java -Xinternalversion` output.
+
+    Only the JRE part is considered, e.g. "JRE (17+35-2724)" or
+    "JRE (1.8.0_392-b08)", since the rest of the line also carries the VM and
+    compiler versions.
+
+    Args:
+        output: The output of `java -Xinternalversion`
+
+    Returns:
+        Optional[int]: The major version number, or None if not found
+    """
+    match = re.search(r"JRE \((\d+)(?:\.(\d+))?", output)
+    if match is None:
+        return None
+    if match.group(2) is None:
+        return int(match.group(1))
+    return _parse_java_version(f"{match.group(1)}.{match.group(2)}")
+
+
+@functools.lru_cache(maxsize=None)
+def _probe_java_version(java_path: Path) -> int:
+    """
+    Determine the major Java version, cheapest method first.
+
+    Reads the installation's `release` file, then falls back to
+    `java -Xinternalversion` (which skips most JVM startup) and finally to
+    `java -version`.
+
+    Args:
+        java_path: Resolved path to the Java executable
 
     Returns:
         int: The major version number
@@ -33,23 +99,57 @@ def get_java_version(java_path: str) -> int:
     Raises:
         RuntimeError: If Java version cannot be determined
     """
+    version = _read_release_version(java_path)
+    if version is not None:
+        return version
+
+    try:
+        result = subprocess.run(
+            [str(java_path), "-Xinternalversion"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+        if result.returncode == 0:
+            version = _parse_internal_version(result.stdout)
+            if version is not None:
+                return version
+    except (OSError, subprocess.TimeoutExpired, ValueError):
+        pass
+
     try:
         result = subprocess.run(
-            [java_path, "-version"],
+            [str(java_path), "-version"],
             capture_output=True,
             text=True,
             check=True,
         )
         version_str = result.stderr.split("\n")[0]
-        # Extract major version number
-        version = version_str.split('"')[1].split(".")[0]
-        if version.startswith("1."):  # Old style version (1.8)
-            version = version_str.split('"')[1].split(".")[1]
-        return int(version)
+        # Extract version number from e.g. 'openjdk version "17.0.2"'
+        return _parse_java_version(version_str.split('"')[1])
     except (subprocess.CalledProcessError, IndexError, ValueError) as err:
         raise RuntimeError(f"Failed to determine Java version: {err}") from err
 
 
+def get_java_version(java_path: str) -> int:
+    """
+    Get the major version of Java from the given path.
+
+    Results are cached per resolved executable path.
+
+    Args:
+        java_path: Path to the Java executable
+
+    Returns:
+        int: The major version number
+
+    Raises:
+        RuntimeError: If Java version cannot be determined
+    """
+    return _probe_java_version(Path(java_path).resolve())
+
+
+@functools.lru_cache(maxsize=1)
 def find_java() -> str:
     """
     Find a suitable Java installation.
@@ -99,6 +199,30 @@ def get_cache_dir() -> Path:
     return Path.home() / ".cache" / "elk-server"
 
 
+def _installed_script(server_dir: Path) -> Optional[Path]:
+    """
+    Get the server script if this ELK version was completely extracted.
+
+    The VERSION file is written last during extraction, so its presence also
+    rules out partially extracted distributions.
+
+    Args:
+        server_dir: The directory of the extracted distribution
+
+    Returns:
+        Optional[Path]: The executable server script, or None if not installed
+    """
+    try:
+        version = (server_dir / "VERSION").read_text().strip()
+    except OSError:
+        return None
+
+    script_path = server_dir / "bin" / "elk-server"
+    if version == ELK_SERVER_VERSION and os.access(script_path, os.X_OK):
+        return script_path
+    return None
+
+
 def extract_distribution(zip_path: str, cache_dir: str) -> str:
     """
     Extract the ELK server distribution.
@@ -114,37 +238,56 @@ def extract_distribution(zip_path: str, cache_dir: str) -> str:
         server_dir = Path(cache_dir) / f"elk-server-{ELK_SERVER_VERSION}"
         script_path = server_dir / "bin" / "elk-server"
 
-        # Only extract if the script doesn't exist
-        if not script_path.exists():
-            # Remove old directory if it exists
-            if server_dir.exists():
-                shutil.rmtree(server_dir)
-
-            # Extract everything
-            with zipfile.ZipFile(zip_path) as zf:
-                zf.extractall(cache_dir)
-
-            # Make the script executable
+        # Skip all zip work if this version was already extracted successfully
+        installed = _installed_script(server_dir)
+        if installed is not None:
+            return str(installed)
+
+        # Extract everything in one pass, restoring executable permissions
+        with zipfile.ZipFile(zip_path) as zf:
+            for info in zf.infolist():
+                # extract() sanitizes the member name, so use the path it wrote
+                dest = zf.extract(info, cache_dir)
+                mode = (info.external_attr >> 16) & 0o777
+                if mode & 0o111:
+                    os.chmod(dest, mode)
+
+        # Make the script executable if the zip carried no Unix permissions
+        if not os.access(script_path, os.X_OK):
             script_path.chmod(0o755)
 
+        # Record the extracted version
+        (server_dir / "VERSION").write_text(ELK_SERVER_VERSION)
+
         return str(script_path)
     except Exception as err:
         raise RuntimeError(f"Failed to extract ELK server distribution: {err}") from err
 
 
-# Create a pooch to manage downloading the server
-server_manager = pooch.create(
-    path=get_cache_dir(),
-    base_url="https://github.com/TypeFox/elk-server/releases/download/",
-    registry={
-        ZIP_FILENAME: None,  # We'll update the hash when we know it
-    },
-    urls={
-        ZIP_FILENAME: ZIP_URL,
-    },
-)
+@functools.lru_cache(maxsize=1)
+def _server_manager():
+    """
+    Create the pooch that manages downloading the server.
+    Deferred until first use so importing elk does no download setup.
 
+    Returns:
+        pooch.Pooch: The download manager
+    """
+    import pooch
+
+    return pooch.create(
+        path=get_cache_dir(),
+        base_url="https://github.com/TypeFox/elk-server/releases/download/",
+        registry={
+            ZIP_FILENAME: None,  # We'll update the hash when we know it
+        },
+        urls={
+            ZIP_FILENAME: ZIP_URL,
+        },
+    )
 
+
+@functools.lru_cache(maxsize=1)
 def ensure_server() -> Path:
     """
     Ensure the ELK server distribution is available and return path to the script.
@@ -156,14 +299,19 @@ def ensure_server() -> Path:
         # Find Java first - this will raise if Java is not available
         find_java()
 
+        # Skip download and hash check if the distribution is already extracted
+        installed = _installed_script(
+            get_cache_dir() / f"elk-server-{ELK_SERVER_VERSION}"
+        )
+        if installed is not None:
+            return installed
+
         # Download the zip file
-        zip_path = server_manager.fetch(ZIP_FILENAME)
+        zip_path = _server_manager().fetch(ZIP_FILENAME)
 
         # Extract the distribution
-        script_path = extract_distribution(
-            zip_path=zip_path, cache_dir=str(get_cache_dir())
+        return Path(
+            extract_distribution(zip_path=zip_path, cache_dir=str(get_cache_dir()))
         )
-
-        return Path(script_path)
     except Exception as err:
         raise RuntimeError("Failed to ensure ELK server is available") from err
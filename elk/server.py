@@ -1,19 +1,131 @@
 #!/usr/bin/env python3
 """ELK server runner module."""
 
-import json
+import asyncio
+import collections
+import os
+import select
+import selectors
+import shlex
 import subprocess
 import sys
-from typing import Optional
+import threading
+import weakref
+from typing import Deque, List, Optional, OrderedDict
 
-from pydantic import validate_call
+import orjson
 
 from .java_utils import ensure_server
-from .types import ElkGraph
+from .types import ElkGraph, validate_graph
 
 # Global server process
 _server_process: Optional[subprocess.Popen] = None
 
+# Background thread starting the server at import, when ELK_EAGER=1
+_warmup_thread: Optional[threading.Thread] = None
+
+# Default capacity of an OS pipe; bounds the requests in flight per round trip
+_PIPE_CAPACITY = 65536
+
+# Pipe capacity requested from Linux for the server's pipes
+_LARGE_PIPE_CAPACITY = 1 << 20
+
+# Capacity of the current server's stdin pipe
+_stdin_capacity = _PIPE_CAPACITY
+
+# Longest response line accepted by the asyncio server reader
+_ASYNC_READ_LIMIT = 1 << 28
+
+# Startup task of the asyncio server process, keyed by its event loop
+_async_servers: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_async_servers_lock = threading.Lock()
+
+# Maximum number of layouts kept by compute_layout's cache
+_LAYOUT_CACHE_SIZE = 128
+
+# Raw layout responses keyed by the sorted-key request line, oldest first
+_layout_cache: "OrderedDict[bytes, bytes]" = collections.OrderedDict()
+
+# Bytes read from the server's stdout that do not form a complete line yet
+_response_buffer = bytearray()
+
+# Waits on the server's stdout and stderr together
+_server_selector: Optional[selectors.BaseSelector] = None
+
+# Bytes the server wrote to stderr that were not reported yet
+_error_buffer = bytearray()
+
+
+def _collect_errors(sel: selectors.BaseSelector, fd: int) -> None:
+    """
+    Read everything the server has written to stderr so far, without blocking.
+    Stops watching stderr once it reaches EOF.
+
+    Args:
+        sel: The selector watching the server's output
+        fd: The file descriptor of the server's stderr
+    """
+    while True:
+        try:
+            chunk = os.read(fd, 65536)
+        except BlockingIOError:
+            return
+        if not chunk:
+            if fd in sel.get_map():
+                sel.unregister(fd)
+            return
+        _error_buffer.extend(chunk)
+
+
+def _take_errors() -> List[str]:
+    """
+    Take the stderr lines collected so far.
+
+    Returns:
+        List[str]: The stripped, non-empty error lines
+    """
+    lines = _error_buffer.decode("utf-8", "replace").splitlines()
+    _error_buffer.clear()
+    return [line.strip() for line in lines if line.strip()]
+
+
+def _warm_up() -> None:
+    """Start the server process ahead of the first layout request."""
+    try:
+        _ensure_server_process()
+    except Exception:
+        # The first compute_layout call retries and reports the error
+        pass
+
+
+def _enlarge_pipes(process: subprocess.Popen) -> int:
+    """
+    Enlarge the server's pipes on Linux so large layouts need fewer wakeups.
+
+    Args:
+        process: The server process
+
+    Returns:
+        int: The resulting capacity of the stdin pipe
+    """
+    try:
+        import fcntl
+    except ImportError:
+        return _PIPE_CAPACITY
+
+    # F_SETPIPE_SZ is only exposed by the fcntl module from Python 3.10
+    set_pipe_size = getattr(fcntl, "F_SETPIPE_SZ", 1031)
+    capacity = _PIPE_CAPACITY
+    for pipe in (process.stdin, process.stdout, process.stderr):
+        try:
+            size = fcntl.fcntl(pipe.fileno(), set_pipe_size, _LARGE_PIPE_CAPACITY)
+        except OSError:
+            # Not Linux, or above the limit in /proc/sys/fs/pipe-max-size
+            continue
+        if pipe is process.stdin:
+            capacity = size
+    return capacity
+
 
 def _ensure_server_process() -> subprocess.Popen:
     """
@@ -26,7 +138,11 @@ def _ensure_server_process() -> subprocess.Popen:
     Raises:
         RuntimeError: If the server process cannot be created
     """
-    global _server_process
+    global _server_process, _server_selector, _stdin_capacity
+
+    # Let an eager startup finish instead of racing it
+    if _warmup_thread is not None and _warmup_thread is not threading.current_thread():
+        _warmup_thread.join()
 
     # Check if we need to create a new process
     if _server_process is None or _server_process.poll() is not None:
@@ -39,8 +155,7 @@ def _ensure_server_process() -> subprocess.Popen:
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
+            bufsize=65536,
         )
 
         if (
@@ -50,9 +165,101 @@ def _ensure_server_process() -> subprocess.Popen:
         ):
             raise RuntimeError("Failed to open subprocess pipes")
 
+        _stdin_capacity = _enlarge_pipes(_server_process)
+
+        # Discard any output left over from a previous process
+        _response_buffer.clear()
+        _error_buffer.clear()
+
+        # Read stderr without blocking, while waiting for responses on stdout
+        os.set_blocking(_server_process.stderr.fileno(), False)
+        if _server_selector is not None:
+            _server_selector.close()
+        _server_selector = selectors.DefaultSelector()
+        _server_selector.register(_server_process.stdout.fileno(), selectors.EVENT_READ)
+        _server_selector.register(_server_process.stderr.fileno(), selectors.EVENT_READ)
+
     return _server_process
 
 
+def _open_exit_handle(pid: int):
+    """
+    Open a handle that becomes readable once the given process exits.
+    Uses pidfd_open on Linux and kqueue on macOS.
+
+    Args:
+        pid: The process id to watch
+
+    Returns:
+        The pidfd or kqueue to register with a selector, or None if unsupported
+    """
+    try:
+        if hasattr(os, "pidfd_open"):
+            return os.pidfd_open(pid)
+        if hasattr(select, "kqueue"):
+            kq = select.kqueue()
+            kq.control(
+                [
+                    select.kevent(
+                        pid,
+                        filter=select.KQ_FILTER_PROC,
+                        flags=select.KQ_EV_ADD | select.KQ_EV_ONESHOT,
+                        fflags=select.KQ_NOTE_EXIT,
+                    )
+                ],
+                0,
+            )
+            return kq
+    except OSError:
+        pass
+    return None
+
+
+def _close_exit_handle(handle) -> None:
+    """
+    Close a handle returned by _open_exit_handle.
+
+    Args:
+        handle: The pidfd or kqueue to close
+    """
+    if isinstance(handle, int):
+        os.close(handle)
+    else:
+        handle.close()
+
+
+def _forward_ready(key, sel, process, outputs) -> None:
+    """
+    Forward one chunk from a ready stream of run_elk_server.
+    Unregisters the stream once it reaches EOF.
+
+    Args:
+        key: The selector key of the ready stream
+        sel: The selector multiplexing the streams
+        process: The server process
+        outputs: Mapping of open server output streams to their destinations
+    """
+    data = os.read(key.fd, 65536)
+
+    if key.data == "stdin":
+        if data:
+            process.stdin.write(data)
+            process.stdin.flush()
+        else:
+            # Close stdin to signal we're done
+            sel.unregister(key.fileobj)
+            process.stdin.close()
+        return
+
+    if not data:
+        sel.unregister(key.fileobj)
+        del outputs[key.data]
+        return
+
+    outputs[key.data].write(data)
+    outputs[key.data].flush()
+
+
 def run_elk_server(mode="stdio"):
     """
     Run the ELK server.
@@ -67,21 +274,18 @@ def run_elk_server(mode="stdio"):
     # Get the path to the ELK server script
     server_script = ensure_server()
 
-    # Initialize jenv and run the server
-    cmd = f"{server_script} --{mode}"
+    cmd = [str(server_script), f"--{mode}"]
 
     print(f"Running ELK server in {mode} mode...", file=sys.stderr)
-    print(f"Command: {cmd}", file=sys.stderr)
+    print(f"Command: {shlex.join(cmd)}", file=sys.stderr)
 
     try:
         process = subprocess.Popen(
             cmd,
-            shell=True,
             stdin=subprocess.PIPE if mode == "stdio" else None,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True,  # This is preferred over universal_newlines
-            bufsize=1,  # Line buffered
+            bufsize=65536,  # Binary pipes with a large buffer
         )
 
         if process.stdout is None or process.stderr is None:
@@ -89,51 +293,50 @@ def run_elk_server(mode="stdio"):
 
         print("\nServer output:", file=sys.stderr)
 
-        # In stdio mode, we need to pass through stdin to the process
-        if mode == "stdio" and process.stdin is not None:
-            # Process each line of input as a separate JSON message
-            for line in sys.stdin:
-                line = line.strip()
-                if not line:
-                    continue
+        # Where each server output stream is forwarded to
+        outputs = {
+            "stdout": sys.stdout.buffer if mode == "stdio" else sys.stderr.buffer,
+            "stderr": sys.stderr.buffer,
+        }
 
-                # Send the JSON message
-                process.stdin.write(line + "\n")
-                process.stdin.flush()
+        with selectors.DefaultSelector() as sel:
+            # In stdio mode, we need to pass through stdin to the process
+            if mode == "stdio" and process.stdin is not None:
+                sel.register(sys.stdin, selectors.EVENT_READ, "stdin")
+            sel.register(process.stdout, selectors.EVENT_READ, "stdout")
+            sel.register(process.stderr, selectors.EVENT_READ, "stderr")
 
-                # Read the response
-                response = process.stdout.readline()
-                if response:
-                    print(response.strip())
+            # Wake up as soon as the server exits, even if its pipes stay open
+            exit_handle = _open_exit_handle(process.pid)
+            if exit_handle is not None:
+                sel.register(exit_handle, selectors.EVENT_READ, "exit")
 
-                # Check for errors
-                error = process.stderr.readline()
-                if error:
-                    print(f"Error: {error.strip()}", file=sys.stderr)
-
-            # Close stdin to signal we're done
-            process.stdin.close()
-
-        # Handle any remaining output
-        while process.poll() is None:
-            # Read stdout
             try:
-                line = process.stdout.readline()
-                if line:
-                    if mode == "stdio":
-                        print(line.strip())
-                    else:
-                        print(line.strip(), file=sys.stderr)
-            except Exception as err:  # Changed from bare except
-                print(f"Error reading stdout: {err}", file=sys.stderr)
-
-            # Read stderr
-            try:
-                error = process.stderr.readline()
-                if error:
-                    print(f"Error: {error.strip()}", file=sys.stderr)
-            except Exception as err:  # Changed from bare except
-                print(f"Error reading stderr: {err}", file=sys.stderr)
+                exited = False
+
+                # Forward whichever stream is ready until the server exits
+                while outputs and not exited:
+                    for key, _ in sel.select():
+                        if key.data == "exit":
+                            exited = True
+                            continue
+
+                        _forward_ready(key, sel, process, outputs)
+
+                # Forward output written just before the server exited
+                for key in list(sel.get_map().values()):
+                    if key.data in outputs:
+                        os.set_blocking(key.fd, False)
+                        while key.data in outputs:
+                            try:
+                                _forward_ready(key, sel, process, outputs)
+                            except BlockingIOError:
+                                break
+            finally:
+                if exit_handle is not None:
+                    _close_exit_handle(exit_handle)
+
+        process.wait()
 
     except KeyboardInterrupt:
         print("\nStopping ELK server...", file=sys.stderr)
@@ -168,57 +371,205 @@ def main():
     run_elk_server(args.mode)
 
 
-@validate_call()
-def compute_layout(graph: dict | ElkGraph) -> dict:
+def _check_ids(graph: dict) -> None:
     """
-    Compute a layout for the given graph using the ELK server.
-    Reuses a single server process across multiple calls.
+    Check that the graph and all of its nested nodes and edges have an id.
+    Walks the tree iteratively, so deep graphs cannot exhaust the stack.
+
+    Args:
+        graph: The graph to be laid out, as a dictionary
+
+    Raises:
+        ValueError: If an element is not a dictionary or has no id
+    """
+    stack = [graph]
+    while stack:
+        element = stack.pop()
+        if not isinstance(element, dict) or "id" not in element:
+            raise ValueError(f"Graph element without an id: {element!r}")
+        stack.extend(element.get("children") or ())
+        stack.extend(element.get("edges") or ())
+
+
+def _prepare_payload(graph: dict | ElkGraph, trust: bool = False) -> bytes:
+    """
+    Validate a graph and serialize it as a request line for the ELK server.
+    Keys are sorted, so the line also serves as compute_layout's cache key.
 
     Args:
         graph: The graph to be laid out, either as a dictionary or ElkGraph model
+        trust: Skip full validation of dictionaries and send them unchanged
 
     Returns:
-        dict: The computed layout from ELK
+        bytes: The JSON data, terminated by a newline
 
     Raises:
-        RuntimeError: If the server fails or returns an error
         ValidationError: If the input validation fails
-        json.JSONDecodeError: If the response cannot be parsed
+        ValueError: If a trusted graph has an element without an id
+    """
+    if trust and isinstance(graph, dict):
+        _check_ids(graph)
+        return orjson.dumps(graph, option=orjson.OPT_SORT_KEYS) + b"\n"
+
+    # Always validate through ElkGraph and send the validated, coerced data
+    validated_graph: ElkGraph = (
+        graph if isinstance(graph, ElkGraph) else validate_graph(graph)
+    )
+    data = validated_graph.model_dump(exclude_none=True)
+    return orjson.dumps(data, option=orjson.OPT_SORT_KEYS) + b"\n"
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """
+    Write all of the data to a file descriptor, bypassing Python's IO stack.
+
+    Args:
+        fd: The file descriptor to write to
+        data: The bytes to write
+    """
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def _read_line(
+    sel: selectors.BaseSelector, stdout_fd: int, stderr_fd: int
+) -> Optional[bytes]:
+    """
+    Read one newline-terminated line from the server's stdout with os.read.
+    Bytes past the newline are kept in the module-level response buffer.
+    Stderr is drained while waiting, so the server never blocks on it.
+
+    Args:
+        sel: The selector watching the server's output
+        stdout_fd: The file descriptor of the server's stdout
+        stderr_fd: The file descriptor of the server's stderr
+
+    Returns:
+        Optional[bytes]: The line without its newline, or None at EOF
+    """
+    search_from = 0
+    while True:
+        newline = _response_buffer.find(b"\n", search_from)
+        if newline >= 0:
+            line = bytes(_response_buffer[:newline])
+            del _response_buffer[: newline + 1]
+            return line
+
+        search_from = len(_response_buffer)
+        ready = {key.fd for key, _ in sel.select()}
+        if stderr_fd in ready:
+            _collect_errors(sel, stderr_fd)
+        if stdout_fd in ready:
+            chunk = os.read(stdout_fd, 65536)
+            if not chunk:
+                _response_buffer.clear()
+                return None
+            _response_buffer.extend(chunk)
+
+
+def _raise_for_errors(errors: List[str]) -> None:
+    """
+    Raise for error lines the ELK server reported alongside a response.
+
+    Args:
+        errors: The stripped, non-empty stderr lines
+
+    Raises:
+        RuntimeError: If any line is a genuine server error
+    """
+    for error in errors:
+        # Only raise if it's not the expected EOF error after successful layout
+        if not error.endswith("End of input at line 2 column 1 path $"):
+            raise RuntimeError(f"ELK server error: {error}") from None
+
+
+def _read_response(process: subprocess.Popen, sel: selectors.BaseSelector) -> bytes:
+    """
+    Read a single layout response from the ELK server.
+
+    Args:
+        process: The server process
+        sel: The selector watching the server's output
+
+    Returns:
+        bytes: The JSON layout from ELK
+
+    Raises:
+        RuntimeError: If the server exits
+    """
+    stderr_fd = process.stderr.fileno()
+    response: Optional[bytes] = _read_line(sel, process.stdout.fileno(), stderr_fd)
+    if response is None:
+        # Collect the remaining error output of the exited server
+        try:
+            process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            pass
+        _collect_errors(sel, stderr_fd)
+        error: str = "\n".join(_take_errors())
+        raise RuntimeError(f"ELK server failed: {error}")
+
+    # Errors the server wrote for this request came before its response, so
+    # they are in the pipe by now; anything written later is reported next time
+    _collect_errors(sel, stderr_fd)
+    return response
+
+
+def _exchange(payloads: List[bytes]) -> List[bytes]:
+    """
+    Send request lines to the ELK server and read back one layout per line.
+
+    Requests are written in chunks of at most the pipe capacity before the
+    matching responses are read, so writes never block on a server that is
+    itself blocked writing responses nobody is reading yet.
+
+    Args:
+        payloads: The serialized graphs
+
+    Returns:
+        List[bytes]: The JSON layouts, in request order
+
+    Raises:
+        RuntimeError: If the server fails, returns an error, or disconnects
     """
     # Get or create the server process
     process: subprocess.Popen = _ensure_server_process()
-
-    if process.stdin is None or process.stdout is None or process.stderr is None:
+    sel = _server_selector
+
+    if (
+        process.stdin is None
+        or process.stdout is None
+        or process.stderr is None
+        or sel is None
+    ):
         raise RuntimeError("Server process has invalid pipes")
 
-    try:
-        # Always validate through ElkGraph
-        validated_graph: ElkGraph = (
-            graph if isinstance(graph, ElkGraph) else ElkGraph(**graph)
-        )
+    stdin_fd = process.stdin.fileno()
 
-        # Send the JSON data without null values
-        json_str: str = validated_graph.model_dump_json(exclude_none=True)
-        process.stdin.write(json_str + "\n")
-        process.stdin.flush()
+    layouts: List[bytes] = []
+    try:
+        start = 0
+        while start < len(payloads):
+            # Always send at least one graph, even if it exceeds the pipe capacity
+            end = start + 1
+            size = len(payloads[start])
+            while end < len(payloads) and size + len(payloads[end]) <= _stdin_capacity:
+                size += len(payloads[end])
+                end += 1
+
+            _write_all(stdin_fd, b"".join(payloads[start:end]))
+
+            # Read every response of the chunk before raising, so none is left
+            # in the pipe to be mistaken for the answer to a later request
+            for _ in range(start, end):
+                layouts.append(_read_response(process, sel))
+            start = end
 
-        # Read the response
-        response: str = process.stdout.readline()
-        if not response:
             # Check for errors
-            error: str = process.stderr.read()
-            raise RuntimeError(f"ELK server failed: {error}")
+            _raise_for_errors(_take_errors())
 
-        # Check for errors
-        error = process.stderr.readline()
-        if error:
-            error = error.strip()
-            # Only raise if it's not the expected EOF error after successful layout
-            if not error.endswith("End of input at line 2 column 1 path $"):
-                raise RuntimeError(f"ELK server error: {error}") from None
-
-        # Parse the response
-        return json.loads(response)
+        return layouts
 
     except (OSError, BrokenPipeError) as e:
         # Server crashed or disconnected - clear the global process
@@ -227,19 +578,350 @@ def compute_layout(graph: dict | ElkGraph) -> dict:
         raise RuntimeError(f"ELK server connection failed: {e}") from e
 
 
+def _cache_layout(payload: bytes, response: bytes) -> None:
+    """
+    Remember the layout response for a request, evicting the oldest entries.
+
+    Args:
+        payload: The serialized graph
+        response: The JSON layout from ELK
+    """
+    _layout_cache[payload] = response
+    _layout_cache.move_to_end(payload)
+    while len(_layout_cache) > _LAYOUT_CACHE_SIZE:
+        _layout_cache.popitem(last=False)
+
+
+def compute_layout(
+    graph: dict | ElkGraph, trust: bool = False, use_cache: bool = True
+) -> dict:
+    """
+    Compute a layout for the given graph using the ELK server.
+    Reuses a single server process across multiple calls.
+
+    Args:
+        graph: The graph to be laid out, either as a dictionary or ElkGraph model
+        trust: Skip full validation of a dictionary graph and only check that
+            its nodes and edges have ids; the data is sent unchanged
+        use_cache: Answer repeated requests for an identical graph from a
+            small in-memory cache instead of the server
+
+    Returns:
+        dict: The computed layout from ELK
+
+    Raises:
+        RuntimeError: If the server fails or returns an error
+        ValidationError: If the input validation fails
+        ValueError: If a trusted graph has an element without an id
+        orjson.JSONDecodeError: If the response cannot be parsed
+    """
+    payload = _prepare_payload(graph, trust)
+
+    if use_cache:
+        cached = _layout_cache.get(payload)
+        if cached is not None:
+            _layout_cache.move_to_end(payload)
+            return orjson.loads(cached)
+
+    response = _exchange([payload])[0]
+    if use_cache:
+        _cache_layout(payload, response)
+
+    # Parse the response
+    return orjson.loads(response)
+
+
+def compute_layouts(graphs: List[dict | ElkGraph], trust: bool = False) -> List[dict]:
+    """
+    Compute layouts for several graphs in as few round trips as possible.
+    All graphs are validated before any of them is sent to the server, and an
+    error reported for any of them fails the whole batch.
+
+    Args:
+        graphs: The graphs to be laid out, as dictionaries or ElkGraph models
+        trust: Skip full validation of dictionary graphs and only check that
+            their nodes and edges have ids; the data is sent unchanged
+
+    Returns:
+        List[dict]: The computed layouts from ELK, in the order of the graphs
+
+    Raises:
+        RuntimeError: If the server fails or returns an error
+        ValidationError: If the input validation fails
+        ValueError: If a trusted graph has an element without an id
+        orjson.JSONDecodeError: If a response cannot be parsed
+    """
+    responses = _exchange([_prepare_payload(graph, trust) for graph in graphs])
+    return [orjson.loads(response) for response in responses]
+
+
+def _wait_for_exit(process: subprocess.Popen, timeout: float) -> None:
+    """
+    Wait for a process to exit, sleeping on a pidfd or kqueue where available
+    instead of polling waitpid.
+
+    Args:
+        process: The process to wait for
+        timeout: Maximum number of seconds to wait
+
+    Raises:
+        subprocess.TimeoutExpired: If the process is still running after timeout
+    """
+    exit_handle = _open_exit_handle(process.pid)
+    if exit_handle is None:
+        process.wait(timeout=timeout)
+        return
+
+    try:
+        with selectors.DefaultSelector() as sel:
+            sel.register(exit_handle, selectors.EVENT_READ)
+            sel.select(timeout)
+    finally:
+        _close_exit_handle(exit_handle)
+
+    # Reap the exited process through Popen so it records the return code
+    if process.poll() is None:
+        raise subprocess.TimeoutExpired(process.args, timeout)
+
+
 def shutdown_server():
     """Shutdown the ELK server process if it's running."""
-    global _server_process
+    global _server_process, _server_selector
+
+    # Let an eager startup finish so it cannot start a server after this
+    if _warmup_thread is not None and _warmup_thread is not threading.current_thread():
+        _warmup_thread.join()
+
     if _server_process is not None:
         try:
             if _server_process.stdin:
                 _server_process.stdin.close()
             _server_process.terminate()
-            _server_process.wait(timeout=1)
+            _wait_for_exit(_server_process, timeout=1)
         except Exception as err:  # Changed from bare except
             print(f"Error shutting down server: {err}", file=sys.stderr)
         finally:
             _server_process = None
+            if _server_selector is not None:
+                _server_selector.close()
+                _server_selector = None
+
+
+class _AsyncElkServer:
+    """
+    An ELK server process driven by asyncio.
+    Requests from concurrent callers are written as they arrive while a single
+    reader task hands each response line to the oldest pending request.
+    """
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self._pending: Deque[asyncio.Future] = collections.deque()
+        self._errors: List[str] = []
+        loop = asyncio.get_running_loop()
+        self._stdout_task = loop.create_task(self._read_responses())
+
+    @property
+    def alive(self) -> bool:
+        """Whether the server can still accept requests."""
+        return self.process.returncode is None and not self._stdout_task.done()
+
+    async def _read_responses(self) -> None:
+        """
+        Resolve pending requests in order with the server's response lines.
+        stderr is merged into stdout, so the error lines written before a
+        response arrive ahead of it and are handed over with it.
+        """
+        try:
+            while True:
+                line = await self.process.stdout.readline()
+                if not line:
+                    break
+                # Responses are JSON objects; anything else is error output
+                if not line.startswith(b"{"):
+                    error = line.decode("utf-8", "replace").strip()
+                    if error:
+                        self._errors.append(error)
+                    continue
+                errors, self._errors = self._errors, []
+                if self._pending:
+                    future = self._pending.popleft()
+                    if not future.done():
+                        future.set_result((line, errors))
+        except asyncio.CancelledError:
+            # asyncio.run cancels every task as its loop shuts down, so the
+            # server is stopped along with the loop it belongs to
+            self._fail_pending(RuntimeError("ELK server connection failed: cancelled"))
+            await self._stop_process()
+            raise
+        except Exception as err:
+            failure = RuntimeError(f"ELK server connection failed: {err}")
+        else:
+            error = "\n".join(self._errors)
+            failure = RuntimeError(f"ELK server failed: {error}")
+        self._fail_pending(failure)
+
+    def _fail_pending(self, failure: Exception) -> None:
+        """
+        Fail every request still waiting for a response.
+
+        Args:
+            failure: The exception to raise in the waiting callers
+        """
+        while self._pending:
+            future = self._pending.popleft()
+            if not future.done():
+                future.set_exception(failure)
+
+    async def request(self, payload: bytes) -> dict:
+        """
+        Send one request line and wait for its layout.
+
+        Args:
+            payload: The serialized graph
+
+        Returns:
+            dict: The computed layout from ELK
+
+        Raises:
+            RuntimeError: If the server fails, returns an error, or disconnects
+        """
+        if not self.alive:
+            raise RuntimeError("ELK server connection failed: server has exited")
+
+        # Queue the future and write without yielding, so replies stay in order
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(future)
+        try:
+            self.process.stdin.write(payload)
+            await self.process.stdin.drain()
+        except (OSError, BrokenPipeError) as e:
+            raise RuntimeError(f"ELK server connection failed: {e}") from e
+
+        response, errors = await future
+
+        # Check for errors
+        _raise_for_errors(errors)
+
+        # Parse the response
+        return orjson.loads(response)
+
+    async def close(self) -> None:
+        """Stop the server process and wait for it to exit."""
+        await self._stop_process()
+        await self._stdout_task
+
+    async def _stop_process(self) -> None:
+        """Terminate the server process, killing it if it does not exit."""
+        if self.process.stdin is not None:
+            self.process.stdin.close()
+        try:
+            self.process.terminate()
+        except ProcessLookupError:
+            pass
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout=1)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
+
+
+async def _start_async_server() -> _AsyncElkServer:
+    """
+    Start an ELK server process on the running event loop.
+
+    Returns:
+        _AsyncElkServer: The started server
+    """
+    # Finding Java and the distribution may block, so keep it off the loop
+    loop = asyncio.get_running_loop()
+    server_script = await loop.run_in_executor(None, ensure_server)
+
+    process = await asyncio.create_subprocess_exec(
+        str(server_script),
+        "--stdio",
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        # One pipe keeps each request's errors in order with its response
+        stderr=subprocess.STDOUT,
+        limit=_ASYNC_READ_LIMIT,
+    )
+    return _AsyncElkServer(process)
+
+
+async def _ensure_async_server() -> _AsyncElkServer:
+    """
+    Ensure an ELK server is running on the current event loop and return it.
+    Concurrent callers share a single startup.
+
+    Returns:
+        _AsyncElkServer: The server
+
+    Raises:
+        RuntimeError: If the server process cannot be created
+    """
+    loop = asyncio.get_running_loop()
+    with _async_servers_lock:
+        # Servers of closed loops were stopped as those loops shut down
+        for closed_loop in [other for other in _async_servers if other.is_closed()]:
+            del _async_servers[closed_loop]
+
+        task = _async_servers.get(loop)
+        if task is None or (
+            task.done()
+            and (
+                task.cancelled()
+                or task.exception() is not None
+                or not task.result().alive
+            )
+        ):
+            task = _async_servers[loop] = loop.create_task(_start_async_server())
+
+    # Shield so one cancelled caller does not abort the startup for the others
+    return await asyncio.shield(task)
+
+
+async def compute_layout_async(graph: dict | ElkGraph, trust: bool = False) -> dict:
+    """
+    Compute a layout for the given graph without blocking the event loop.
+    Concurrent calls are pipelined through a single server process per loop.
+
+    Args:
+        graph: The graph to be laid out, either as a dictionary or ElkGraph model
+        trust: Skip full validation of a dictionary graph and only check that
+            its nodes and edges have ids; the data is sent unchanged
+
+    Returns:
+        dict: The computed layout from ELK
+
+    Raises:
+        RuntimeError: If the server fails or returns an error
+        ValidationError: If the input validation fails
+        ValueError: If a trusted graph has an element without an id
+        orjson.JSONDecodeError: If the response cannot be parsed
+    """
+    payload = _prepare_payload(graph, trust)
+    server = await _ensure_async_server()
+    return await server.request(payload)
+
+
+async def shutdown_server_async():
+    """Shutdown the ELK server process of the current event loop if it's running."""
+    with _async_servers_lock:
+        task = _async_servers.pop(asyncio.get_running_loop(), None)
+    if task is None:
+        return
+    try:
+        server = await task
+    except Exception:
+        return
+    await server.close()
+
+
+# Hide JVM startup behind the caller's own work when requested
+if os.environ.get("ELK_EAGER") == "1":
+    _warmup_thread = threading.Thread(target=_warm_up, daemon=True)
+    _warmup_thread.start()
 
 
 if __name__ == "__main__":
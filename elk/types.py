@@ -119,3 +119,7 @@ class ElkGraph(BaseModel):
     properties: ElkProperties | None = None
     children: List[ElkNode] | None = None
     edges: List[ElkEdge] | None = None
+
+
+# Validate raw data against ElkGraph without the keyword unpacking of __init__
+validate_graph = ElkGraph.__pydantic_validator__.validate_python
@@ -0,0 +1,103 @@
+"""Tests for the Java and ELK distribution utilities."""
+
+import os
+import zipfile
+
+from elk.java_utils import (
+    ELK_SERVER_VERSION,
+    _parse_internal_version,
+    extract_distribution,
+    get_java_version,
+)
+
+
+def _make_distribution(zip_path):
+    """Write a minimal ELK server distribution zip."""
+    script = zipfile.ZipInfo(f"elk-server-{ELK_SERVER_VERSION}/bin/elk-server")
+    script.external_attr = 0o755 << 16
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr(script, "#!/bin/sh\n")
+        zf.writestr(f"elk-server-{ELK_SERVER_VERSION}/lib/elk.jar", "jar")
+
+
+def test_java_version_from_release_file(tmp_path):
+    """Test the Java version is read from the release file without running Java."""
+    (tmp_path / "bin").mkdir()
+    java_path = tmp_path / "bin" / "java"
+    java_path.write_text("")  # Never executed
+    (tmp_path / "release").write_text('IMPLEMENTOR="Eclipse"\nJAVA_VERSION="17.0.9"\n')
+
+    assert get_java_version(str(java_path)) == 17
+
+
+def test_legacy_java_version_from_release_file(tmp_path):
+    """Test old style 1.x versions are reported by their minor number."""
+    (tmp_path / "bin").mkdir()
+    java_path = tmp_path / "bin" / "java"
+    java_path.write_text("")
+    (tmp_path / "release").write_text('JAVA_VERSION="1.8.0_392"\n')
+
+    assert get_java_version(str(java_path)) == 8
+
+
+def test_java_version_from_internal_version():
+    """Test the -Xinternalversion output is parsed from its JRE part only."""
+    ga_17 = (
+        "OpenJDK 64-Bit Server VM (17+35-2724) for linux-amd64 JRE (17+35-2724), "
+        'built on Aug  5 2021 23:26:02 by "mach5one" with gcc 10.3.0'
+    )
+    ga_21 = (
+        "OpenJDK 64-Bit Server VM (21+35-2513) for linux-amd64 JRE (21+35-2513), "
+        'built on 2023-08-09T20:25:10Z by "mach5one" with gcc 11.2.0'
+    )
+    update_17 = (
+        "OpenJDK 64-Bit Server VM (17.0.9+9) for linux-amd64 JRE (17.0.9+9), "
+        'built on Oct 17 2023 by "temurin" with gcc 11.2.0'
+    )
+    legacy = (
+        "OpenJDK 64-Bit Server VM (25.392-b08) for linux-amd64 JRE "
+        '(1.8.0_392-b08), built on Oct 17 2023 by "temurin" with gcc 7.5.0'
+    )
+
+    assert _parse_internal_version(ga_17) == 17
+    assert _parse_internal_version(ga_21) == 21
+    assert _parse_internal_version(update_17) == 17
+    assert _parse_internal_version(legacy) == 8
+    assert _parse_internal_version("with gcc 10.3.0") is None
+
+
+def test_extract_distribution_is_skipped_once_installed(tmp_path):
+    """Test an installed distribution is reused without opening the zip again."""
+    zip_path = tmp_path / "elk-server.zip"
+    _make_distribution(zip_path)
+    cache_dir = tmp_path / "cache"
+
+    script_path = extract_distribution(str(zip_path), str(cache_dir))
+    assert os.access(script_path, os.X_OK)
+    assert (cache_dir / f"elk-server-{ELK_SERVER_VERSION}" / "lib" / "elk.jar").exists()
+    assert (cache_dir / f"elk-server-{ELK_SERVER_VERSION}" / "VERSION").exists()
+
+    # The zip is no longer needed once the distribution is installed
+    zip_path.unlink()
+    assert extract_distribution(str(zip_path), str(cache_dir)) == script_path
+
+
+def test_extract_distribution_stays_inside_cache_dir(tmp_path):
+    """Test permissions are only applied to the files written in the cache."""
+    outside = tmp_path / "outside"
+    outside.write_text("keep")
+    outside.chmod(0o644)
+
+    zip_path = tmp_path / "elk-server.zip"
+    _make_distribution(zip_path)
+    member = zipfile.ZipInfo(str(outside))  # Absolute member name
+    member.external_attr = 0o777 << 16
+    with zipfile.ZipFile(zip_path, "a") as zf:
+        zf.writestr(member, "zip")
+
+    cache_dir = tmp_path / "cache"
+    extract_distribution(str(zip_path), str(cache_dir))
+
+    assert outside.read_text() == "keep"
+    assert outside.stat().st_mode & 0o777 == 0o644
+    assert (cache_dir / str(outside).lstrip("/")).stat().st_mode & 0o777 == 0o777
@@ -1,9 +1,49 @@
 """Tests for the ELK server layout computation."""
 
+import asyncio
+import concurrent.futures
+import os
+import sys
+import threading
+import time
+
+import orjson
 import pydantic
 import pytest
 
-from elk.server import compute_layout, shutdown_server
+import elk.server
+from elk.server import (
+    _prepare_payload,
+    compute_layout,
+    compute_layout_async,
+    compute_layouts,
+    shutdown_server,
+    shutdown_server_async,
+)
+from elk.types import ElkNode
+
+# Stand-in for the ELK server that reports an error for graphs with a "bad" id
+FAKE_SERVER = """
+import json, sys
+for line in sys.stdin:
+    graph = json.loads(line)
+    if graph["id"].startswith("bad"):
+        print(f"Failed to lay out {graph['id']}", file=sys.stderr, flush=True)
+    print(json.dumps({graph["id"]: {}}), flush=True)
+"""
+
+
+@pytest.fixture
+def fake_server(tmp_path, monkeypatch):
+    """Run layouts against FAKE_SERVER instead of the ELK server."""
+    script = tmp_path / "elk-server"
+    script.write_text(f"#!{sys.executable}\n{FAKE_SERVER}")
+    script.chmod(0o755)
+
+    shutdown_server()
+    monkeypatch.setattr(elk.server, "ensure_server", lambda: script)
+    yield
+    shutdown_server()
 
 
 def test_valid_layout():
@@ -92,11 +132,11 @@ def test_multiple_layouts():
 
     try:
         # First layout should start the server
-        layout1 = compute_layout(simple_graph)
+        layout1 = compute_layout(simple_graph, use_cache=False)
         assert layout1["n1"]["size"]["width"] == 30
 
         # Second layout should reuse the server
-        layout2 = compute_layout(simple_graph)
+        layout2 = compute_layout(simple_graph, use_cache=False)
         assert layout2["n1"]["size"]["width"] == 30
 
         # Both layouts should be valid but potentially different
@@ -104,3 +144,195 @@ def test_multiple_layouts():
 
     finally:
         shutdown_server()
+
+
+def test_batch_layouts():
+    """Test computing several layouts in one call preserves their order."""
+    graphs = [
+        {"id": "root", "children": [{"id": f"n{i}", "width": 10 + i, "height": 30}]}
+        for i in range(5)
+    ]
+
+    try:
+        layouts = compute_layouts(graphs)
+        assert len(layouts) == len(graphs)
+        for i, layout in enumerate(layouts):
+            assert layout[f"n{i}"]["size"]["width"] == 10 + i
+
+        # Batched results match individually computed ones
+        assert layouts[0] == compute_layout(graphs[0])
+
+    finally:
+        shutdown_server()
+
+
+def test_concurrent_async_layouts():
+    """Test concurrent async layouts are each answered with their own result."""
+    graphs = [
+        {"id": "root", "children": [{"id": f"n{i}", "width": 10 + i, "height": 30}]}
+        for i in range(5)
+    ]
+
+    async def run():
+        try:
+            return await asyncio.gather(*map(compute_layout_async, graphs))
+        finally:
+            await shutdown_server_async()
+
+    layouts = asyncio.run(run())
+    for i, layout in enumerate(layouts):
+        assert layout[f"n{i}"]["size"]["width"] == 10 + i
+
+
+def test_async_server_is_stopped_with_its_loop(fake_server):
+    """Test a loop finishing without shutdown_server_async stops its server."""
+    graph = {"id": "root", "children": [{"id": "n1", "width": 30, "height": 30}]}
+
+    async def run():
+        await compute_layout_async(graph)
+        task = elk.server._async_servers[asyncio.get_running_loop()]
+        return task.result().process.pid
+
+    for _ in range(3):
+        pid = asyncio.run(run())
+        with pytest.raises(ProcessLookupError):
+            os.kill(pid, 0)
+
+
+def test_async_servers_are_per_loop(fake_server):
+    """Test loops running in separate threads do not stop each other's servers."""
+    barrier = threading.Barrier(2)
+
+    def run(thread):
+        async def layouts():
+            barrier.wait()
+            try:
+                return [
+                    await compute_layout_async({"id": f"t{thread}-{i}"})
+                    for i in range(100)
+                ]
+            finally:
+                await shutdown_server_async()
+
+        return asyncio.run(layouts())
+
+    with concurrent.futures.ThreadPoolExecutor(2) as pool:
+        results = list(pool.map(run, range(2)))
+
+    assert results == [[{f"t{t}-{i}": {}} for i in range(100)] for t in range(2)]
+
+
+def test_trusted_layout():
+    """Test trusted graphs skip validation but still need ids."""
+    graph = {"id": "root", "children": [{"id": "n1", "width": 30, "height": 30}]}
+
+    try:
+        layout = compute_layout(graph, trust=True)
+        assert layout["n1"]["size"]["width"] == 30
+
+        with pytest.raises(ValueError):
+            compute_layout({"id": "root", "children": [{"width": 30}]}, trust=True)
+
+    finally:
+        shutdown_server()
+
+
+def test_cached_layouts_are_independent():
+    """Test repeated layouts come from the cache as separate copies."""
+    graph = {"id": "root", "children": [{"id": "n1", "width": 30, "height": 30}]}
+
+    try:
+        layout1 = compute_layout(graph)
+        layout1["n1"]["size"]["width"] = 0
+
+        layout2 = compute_layout(graph)
+        assert layout2["n1"]["size"]["width"] == 30
+        assert compute_layout(graph, use_cache=False) == layout2
+
+    finally:
+        shutdown_server()
+
+
+def test_cache_ignores_key_order(fake_server, monkeypatch):
+    """Test trusted graphs that differ only in key order share a cache entry."""
+    graph = {"id": "ordered", "layoutOptions": {"a": "1", "b": "2"}}
+    layout = compute_layout(graph, trust=True)
+
+    def fail(payloads):
+        raise AssertionError("request reached the server")
+
+    monkeypatch.setattr(elk.server, "_exchange", fail)
+    graph = {"layoutOptions": {"b": "2", "a": "1"}, "id": "ordered"}
+    assert compute_layout(graph, trust=True) == layout
+
+
+def test_shutdown_waits_for_eager_startup(fake_server, monkeypatch):
+    """Test a server started eagerly in the background is also shut down."""
+    ensure_server = elk.server.ensure_server
+
+    def slow_ensure_server():
+        time.sleep(0.2)
+        return ensure_server()
+
+    monkeypatch.setattr(elk.server, "ensure_server", slow_ensure_server)
+    warmup_thread = threading.Thread(target=elk.server._warm_up, daemon=True)
+    monkeypatch.setattr(elk.server, "_warmup_thread", warmup_thread)
+    warmup_thread.start()
+
+    shutdown_server()
+    assert not warmup_thread.is_alive()
+    assert elk.server._server_process is None
+
+
+def test_errors_are_reported_with_their_request(fake_server):
+    """Test a server error fails the request that caused it, not the next one."""
+    for i in range(200):
+        with pytest.raises(RuntimeError, match=f"bad{i}"):
+            compute_layout({"id": f"bad{i}"}, use_cache=False)
+        assert compute_layout({"id": f"good{i}"}, use_cache=False) == {f"good{i}": {}}
+
+
+def test_concurrent_async_errors_are_reported_with_their_request(fake_server):
+    """Test concurrent async requests each get only their own server errors."""
+    ids = [f"bad{i}" if i % 3 == 0 else f"good{i}" for i in range(300)]
+
+    async def run():
+        try:
+            return await asyncio.gather(
+                *(compute_layout_async({"id": id_}) for id_ in ids),
+                return_exceptions=True,
+            )
+        finally:
+            await shutdown_server_async()
+
+    for id_, result in zip(ids, asyncio.run(run())):
+        if id_.startswith("bad"):
+            assert isinstance(result, RuntimeError)
+            assert str(result) == f"ELK server error: Failed to lay out {id_}"
+        else:
+            assert result == {id_: {}}
+
+
+def test_failed_batch_leaves_no_stale_responses(fake_server):
+    """Test a batch failing part way does not shift later responses."""
+    with pytest.raises(RuntimeError, match="bad"):
+        compute_layouts([{"id": "a"}, {"id": "bad"}, {"id": "c"}, {"id": "d"}])
+
+    assert compute_layout({"id": "x"}, use_cache=False) == {"x": {}}
+    assert compute_layout({"id": "y"}, use_cache=False) == {"y": {}}
+
+
+def test_payload_accepts_models_inside_dicts():
+    """Test dict graphs may contain model instances, as validation allows."""
+    graph = {"id": "root", "children": [ElkNode(id="n1", width=30, height=30)]}
+
+    request = orjson.loads(_prepare_payload(graph))
+    assert request["children"] == [{"id": "n1", "width": 30.0, "height": 30.0}]
+
+
+def test_payload_sends_coerced_values():
+    """Test values coerced by validation are sent in their validated form."""
+    graph = {"id": "root", "children": [{"id": "n1", "width": "30", "height": 30}]}
+
+    request = orjson.loads(_prepare_payload(graph))
+    assert request["children"][0]["width"] == 30.0